@@ -2,11 +2,26 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
+from collections import deque
+from importlib.util import find_spec
 from datetime import datetime
+from kernels import build_render_arrays, rolling_sum
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+    DOWNSAMPLER = MinMaxLTTBDownsampler()
+except ImportError:  # tsdownsample is optional, charts render every point
+    DOWNSAMPLER = None
+
+MAX_CHART_POINTS = 1000  # LTTB target for the MSI line history when resampling
+ZOOM_MINUTES = 15  # Default x-range shows this many minutes before the last round
 
 # ===== PERFORMANCE OPTIMIZATIONS =====
 np.seterr(divide='ignore', invalid='ignore')  # Disable Numpy warnings
 pd.options.mode.chained_assignment = None  # Disable Pandas SettingWithCopyWarning
+if find_spec("orjson") is not None:
+    pio.json.config.default_engine = "orjson"  # C serializer for chart JSON, fast path for ndarrays
 
 # ============== AI AGENTS ==============
 class PatternDetector:
@@ -15,7 +30,7 @@ class PatternDetector:
         if len(msi_values) < 15:
             return {}
         
-        series = pd.Series(msi_values)
+        series = pd.Series(msi_values, dtype=np.float64)
         
         # Use .iloc for positional indexing
         last_val = series.iloc[-1] if len(series) >= 1 else 0
@@ -31,20 +46,48 @@ class ForecastEnhancer:
     def enhance(self, current_forecast, history):
         """Adds confidence intervals to original forecast"""
         vol = np.std(history[-10:]) if len(history) >=10 else 1
+        f = np.asarray(current_forecast, dtype=np.float32)
         return {
-            'original': current_forecast,
-            'low': [x - vol*0.7 for x in current_forecast],
-            'high': [x + vol*1.2 for x in current_forecast]
+            'original': f,
+            'low': f - vol*0.7,
+            'high': f + vol*1.2
         }
 
+# The enhancer is a pure function of the forecast and the last 10 msi
+# values; the chart and the forecast bubble both call it on each rerun.
+# The cache is shared by all sessions, so it is bounded.
+_ARRAY_HASH = {np.ndarray: lambda a: a.tobytes()}
+
+@st.cache_data(show_spinner=False, hash_funcs=_ARRAY_HASH, max_entries=64)
+def enhance_forecast(current_forecast, history):
+    return ForecastEnhancer().enhance(current_forecast, history)
+
 def get_msi_slope(df, window=3):
         if len(df) < window + 1:
             return 0.0
-        y = df["msi"].iloc[-(window+1):].values
-        x = np.arange(len(y))
-        slope = np.polyfit(x, y, 1)[0]
-        return round(slope, 2)
+        y = df["msi"].to_numpy()[-(window+1):]
+        # Least-squares slope against fixed x = 0..window, no polyfit/LAPACK call
+        x_centered = np.arange(window + 1) - window / 2
+        slope = (x_centered * (y - y.mean())).sum() / (x_centered ** 2).sum()
+        return round(float(slope), 2)
+
+ROUND_TYPES = ["Blue", "Purple", "Pink"]
+
+def classify_types(multipliers, pink_threshold):
+    """Vectorized Blue/Purple/Pink labels for an array of multipliers"""
+    m = np.asarray(multipliers, dtype=np.float64)
+    labels = np.select([m >= pink_threshold, m >= 2.0], ["Pink", "Purple"], default="Blue")
+    return pd.Categorical(labels, categories=ROUND_TYPES, ordered=True)
 
+def score_rounds(multipliers, pink_threshold):
+    """Vectorized round scores: +2 Pink, +1 Purple, -1 Blue"""
+    m = np.asarray(multipliers, dtype=np.float64)
+    return np.select([m >= pink_threshold, m >= 2.0], [2, 1], default=-1)
+
+def time_axis(timestamps):
+    """Minutes since the first round"""
+    ts = np.asarray(timestamps, dtype="datetime64[ns]")
+    return ((ts - ts.min()).astype(np.int64) / 60e9).astype(np.float32)
 
 
 # ============== CORE APP ==============
@@ -63,8 +106,141 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ================ SESSION STATE =====================
-if "roundsc" not in st.session_state:
-    st.session_state.roundsc = []
+# Rounds live in typed column buffers (structure of arrays) that grow by
+# doubling; a DataFrame is only materialized from views for display.
+ROUND_DTYPES = {
+    "timestamp": "datetime64[ns]",
+    "multiplier": np.float64,  # Kept at input precision so threshold compares match entry
+    "score": np.int8,
+    "msi": np.float32,  # Window sums of int8 scores; float only for the NaN warm-up
+    "momentum": np.int32,
+}
+
+def reset_rounds(capacity=0):
+    ss = st.session_state
+    ss.rounds = {name: np.empty(capacity, dtype=dtype) for name, dtype in ROUND_DTYPES.items()}
+    ss.n_rounds = 0
+    ss.rounds_version = ss.get("rounds_version", 0) + 1
+    ss.last_len = 0
+    ss.cache_key = None
+    ss.msi_window = deque()
+    ss.msi_sum = 0
+    ss.momentum_last = 0
+
+def append_round(timestamp, multiplier):
+    """Appends one round, doubling the column buffers when they are full"""
+    ss = st.session_state
+    n = ss.n_rounds
+    if n == len(ss.rounds["multiplier"]):
+        for name, buf in ss.rounds.items():
+            grown = np.empty(max(64, 2 * len(buf)), dtype=buf.dtype)
+            grown[:n] = buf[:n]
+            ss.rounds[name] = grown
+    ss.rounds["timestamp"][n] = np.datetime64(timestamp, "ns")
+    ss.rounds["multiplier"][n] = multiplier
+    ss.n_rounds = n + 1
+    ss.rounds_version += 1
+
+def set_rounds(timestamps, multipliers):
+    """Replaces the whole history; derived columns are rebuilt on the next sync"""
+    reset_rounds(len(multipliers))
+    st.session_state.rounds["timestamp"][:] = timestamps
+    st.session_state.rounds["multiplier"][:] = multipliers
+    st.session_state.n_rounds = len(multipliers)
+
+def apply_log_edits(editor_key, offset):
+    """Round log on_change: applies only the edited, deleted and added rows"""
+    ss = st.session_state
+    edits = ss[editor_key]
+    cols = ss.rounds
+    # Row positions are relative to the displayed tail, which starts at offset
+    for pos, changes in edits["edited_rows"].items():
+        i = offset + int(pos)
+        if changes.get("timestamp") is not None:
+            cols["timestamp"][i] = pd.Timestamp(changes["timestamp"]).to_datetime64()
+        if changes.get("multiplier") is not None:
+            cols["multiplier"][i] = changes["multiplier"]
+    if edits["deleted_rows"]:
+        n = ss.n_rounds
+        keep = np.ones(n, dtype=bool)
+        keep[[offset + int(pos) for pos in edits["deleted_rows"]]] = False
+        set_rounds(cols["timestamp"][:n][keep], cols["multiplier"][:n][keep])
+    for row in edits["added_rows"]:
+        if row.get("multiplier") is not None:
+            added_at = row.get("timestamp")
+            append_round(pd.Timestamp(added_at) if added_at else datetime.now(), row["multiplier"])
+
+    ss.cache_key = None  # Derived columns are rebuilt on the next sync
+    ss.rounds_version += 1
+    ss.editor_gen += 1  # Fresh editor so these edits are not replayed on the new data
+
+def sync_rounds(window, pink_threshold):
+    """Fills score/msi/momentum for rounds added since the last rerun"""
+    ss = st.session_state
+    key = (window, pink_threshold)
+    if ss.cache_key != key:
+        # Settings changed: derive every row again
+        ss.last_len = 0
+        ss.cache_key = key
+        ss.msi_window = deque()
+        ss.msi_sum = 0
+        ss.momentum_last = 0
+
+    start, n = ss.last_len, ss.n_rounds
+    if n == start:
+        return
+    cols = ss.rounds
+    scores = score_rounds(cols["multiplier"][start:n], pink_threshold)
+
+    if start == 0:
+        # Full build: one kernel pass, then seed the running window from the end
+        msi = rolling_sum(scores.astype(np.int32), window)
+        ss.msi_window = deque(scores[-window:].tolist())
+        ss.msi_sum = sum(ss.msi_window)
+    else:
+        # Running window sum: add the new score, drop the one leaving the window
+        msi = np.empty(len(scores), dtype=np.float32)
+        for i, score in enumerate(scores):
+            ss.msi_window.append(score)
+            ss.msi_sum += score
+            if len(ss.msi_window) > window:
+                ss.msi_sum -= ss.msi_window.popleft()
+            msi[i] = ss.msi_sum if len(ss.msi_window) == window else np.nan
+
+    # Running cumsum carried across reruns, like the msi window sum above
+    momentum = ss.momentum_last + np.cumsum(scores)
+    ss.momentum_last = int(momentum[-1])
+    cols["score"][start:n] = scores
+    cols["msi"][start:n] = msi
+    cols["momentum"][start:n] = momentum
+    ss.last_len = n
+
+def memoize(name, key, compute):
+    """Per-session memo: reruns reuse the value until its key changes"""
+    memo = st.session_state.memo
+    if name not in memo or memo[name][0] != key:
+        memo[name] = (key, compute())
+    return memo[name][1]
+
+def rounds_frame(pink_threshold):
+    """DataFrame over the filled part of the column buffers"""
+    n = st.session_state.n_rounds
+    cols = {name: buf[:n] for name, buf in st.session_state.rounds.items()}
+    return pd.DataFrame({
+        "timestamp": cols["timestamp"],
+        "multiplier": cols["multiplier"],
+        "score": cols["score"],
+        "type": classify_types(cols["multiplier"], pink_threshold),
+        "msi": cols["msi"],
+        "momentum": cols["momentum"],
+    }, copy=False)
+
+if "rounds" not in st.session_state:
+    reset_rounds()
+if "memo" not in st.session_state:
+    st.session_state.memo = {}
+if "editor_gen" not in st.session_state:
+    st.session_state.editor_gen = 0
 if "ga_pattern" not in st.session_state:
     st.session_state.ga_pattern = None
 if "forecast_msi" not in st.session_state:
@@ -77,7 +253,7 @@ with st.sidebar:
     PINK_THRESHOLD = st.number_input("💎 Pink Threshold", value=10.0)
     STRICT_RTT = st.checkbox("🔒 Strict RTT Mode", value=False)
     if st.button("🔄 Full Reset", help="Clear all historical data"):
-        st.session_state.roundsc = []
+        reset_rounds()
         st.session_state.ga_pattern = None
         st.session_state.forecast_msi = []
         st.rerun()
@@ -88,32 +264,35 @@ with st.container(border=True):
         mult = st.number_input("🎯 Enter Round Multiplier", min_value=0.01, step=0.01)
     with col2:
         if st.button("🚀 Add Round", use_container_width=True):
-            score = 2 if mult >= PINK_THRESHOLD else (1 if mult >= 2.0 else -1)
-            st.session_state.roundsc.append({
-                "timestamp": datetime.now(),
-                "multiplier": mult,
-                "score": score
-            })
+            append_round(datetime.now(), mult)
 
 # =================== MAIN ANALYSIS ========================
-df = pd.DataFrame(st.session_state.roundsc)
+sync_rounds(WINDOW_SIZE, PINK_THRESHOLD)
+# Derived data only depends on the rounds and these two settings, so
+# toggling unrelated widgets reuses everything computed for this key
+data_key = (st.session_state.rounds_version, WINDOW_SIZE, PINK_THRESHOLD)
+df = memoize("frame", data_key, lambda: rounds_frame(PINK_THRESHOLD))
 
 if not df.empty:
-
-
-    
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    df["type"] = df["multiplier"].apply(lambda x: "Pink" if x >= PINK_THRESHOLD else ("Purple" if x >= 2 else "Blue"))
-    df["msi"] = df["score"].rolling(WINDOW_SIZE).sum()  # Original calculation preserved
-    df["momentum"] = df["score"].cumsum()
+    # Relative minutes, shared by every chart trace
+    time_deltas = memoize(
+        "time_axis", data_key, lambda: time_axis(df['timestamp'].to_numpy()))
+    # Plain ndarray views for scalar reads and counts below
+    msi_arr = df['msi'].to_numpy()
+    mult_arr = df['multiplier'].to_numpy()
+    score_arr = df['score'].to_numpy()
+    momentum_arr = df['momentum'].to_numpy()
+    # Zone fills and pullback trap mask for the chart, one fused pass
+    render_arrays = memoize(
+        "render_arrays", data_key, lambda: build_render_arrays(msi_arr, mult_arr))
 
     # ======= MDI Calculation =======
     mdi_value = None
     mdi_note = "N/A"
     
-    if len(df) >= 6:
-        msi_delta = df["msi"].iloc[-1] - df["msi"].iloc[-6]
-        mom_delta = df["momentum"].iloc[-1] - df["momentum"].iloc[-6]
+    if msi_arr.size >= 6:
+        msi_delta = msi_arr[-1] - msi_arr[-6]
+        mom_delta = momentum_arr[-1] - momentum_arr[-6]
     
         if mom_delta != 0:
             mdi_value = round(msi_delta / mom_delta, 2)
@@ -125,23 +304,13 @@ if not df.empty:
                 mdi_note = "⚖️ Neutral Divergence"
                 
     # ============== ENHANCED VISUALIZATION ==============
-    def create_msi_chart(df):
-        
-        
-        
-        # Create modern Plotly chart
+    def build_msi_figure():
+        """Chart skeleton built once per session; reruns only swap trace data"""
         fig = go.Figure()
-        if df.empty:
-            return fig
-        
-        # Convert timestamps to relative time deltas
-        time_deltas = (df['timestamp'] - df['timestamp'].min()).dt.total_seconds()/60  # Minutes
-
 
         # Burst Zone (>=6)
         # Add zones first so MSI line draws on top
         fig.add_trace(go.Scatter(
-            x=time_deltas, y=df['msi'].where(df['msi'] >= 6, None ),
             fill='tozeroy',
             fillcolor='rgba(255,105,180,0.3)',
             name='Burst Zone',
@@ -154,7 +323,6 @@ if not df.empty:
         
         # Surge Zone (3 < x <6)
         fig.add_trace(go.Scatter(
-            x=time_deltas, y=df['msi']. where (df['msi'] >= 3, df['msi'] < 6),
             fill='tozeroy',
             fillcolor='rgba(0,255,255,0.3)',
             name='Surge Zone',
@@ -163,34 +331,34 @@ if not df.empty:
             showlegend=True,
             hoverinfo='skip',
             mode='none',
-            
         ))
         
-            
         # Pullback Zone (<=-3)
         fig.add_trace(go.Scatter(
-        x=time_deltas, y=df['msi']. where (df['msi'] <= -3, None),
-        fill='tozeroy',
-        fillcolor='rgba(255,51,51,0.3)',
-        name='Pullback Zone',
-        line=dict(width=0),
-        visible=True,
-        showlegend=True,
-        hoverinfo='skip',
-        mode='none',
-        
+            fill='tozeroy',
+            fillcolor='rgba(255,51,51,0.3)',
+            name='Pullback Zone',
+            line=dict(width=0),
+            visible=True,
+            showlegend=True,
+            hoverinfo='skip',
+            mode='none',
         ))
         
         # Main MSI line
         fig.add_trace(go.Scatter(
-            x=time_deltas,
-            y=df['msi'],
             name='MSI',
             line=dict(color='#00f7ff', width=3),
-            customdata=df['timestamp'],
             hovertemplate='<b>%{customdata|%H:%M:%S}</b><br>MSI: %{y:.2f}<extra></extra>'
         ))
 
+        # Enhanced forecast, hidden until one is available
+        fig.add_trace(go.Scatter(
+            name='Forecast',
+            line=dict(color='#ff00ff', width=2, dash='dot'),
+            visible=False
+        ))
+
         # ===== 1. Zero Axis Line =====
         fig.add_hline(
             y=0, 
@@ -201,60 +369,8 @@ if not df.empty:
             annotation_text="0", 
             annotation_position="bottom right"
         )
-        
-        # ===== 2. Pullback Trap Detection =====
-        pullback_zones = []
-        for i in range(2, len(df)):
-            m1, m2, m3 = df['multiplier'].iloc[i-2:i+1].values
-            msi_now = df['msi'].iloc[i]
-            try:
-                if msi_now >= 2:
-                    three_blues = m1 < 2.0 and m2 < 2.0 and m3 < 2.0
-                    two_desc = m2 < 2.0 and m3 < 2.0 and m2 > m3
-                
-                    if three_blues or two_desc:
-                        # Convert timestamp to relative minutes
-                        center = time_deltas.iloc[i]
-                        pullback_zones.append((
-                            max(0, center - 0.5),  # x0
-                            center + 0.5           # x1
-                        ))
-            except IndexError:
-                continue
-    
-        # Add pullback zones as shapes
-        for zone in pullback_zones:
-            fig.add_vrect(
-                x0=zone[0], x1=zone[1],
-                fillcolor="red", opacity=0.15,
-                layer="above", line_width=0
-            )
-            
-        
-        # Add enhanced forecast if available
-        if st.session_state.forecast_msi and len(df) > 3:
-            try:
-                enhancer = ForecastEnhancer()
-                enhanced = enhancer.enhance(st.session_state.forecast_msi, df['msi'].values[-10:])
-                
-                forecast_times = [time_deltas.iloc[-1] + i*5 for i in [1,2,3]]  # 5-min intervals
-                
-                fig.add_trace(go.Scatter(
-                    x=forecast_times,
-                    y=enhanced['original'],
-                    name='Forecast',
-                    line=dict(color='#ff00ff', width=2, dash='dot'),
-                    error_y=dict(
-                        type='data',
-                        symmetric=False,
-                        array=[h-l for h,l in zip(enhanced['high'], enhanced['low'])],
-                        arrayminus=[o-l for o,l in zip(enhanced['original'], enhanced['low'])]
-                    )
-                ))
-            except Exception as e:
-                st.error(f"Forecast error: {str(e)}")
-            
-         # Layout configuration
+
+        # Layout configuration
         fig.update_layout(
             xaxis=dict(
                 title='Minutes Since First Round',
@@ -274,31 +390,104 @@ if not df.empty:
             x=1
         
         ))
+        return fig
+
+    def create_msi_chart(df, time_deltas, render_arrays):
+        if "msi_fig" not in st.session_state:
+            st.session_state.msi_fig = build_msi_figure()
+        fig = st.session_state.msi_fig
+        if df.empty:
+            return fig
         
-        # Dynamic zoom for recent activity
-        if len(time_deltas) > 10:
-            last_time = time_deltas.iloc[-1]
-            fig.update_xaxes(range=[max(0, last_time-15), last_time+5])
+        msi = df['msi'].to_numpy()
+        burst, surge, pull, traps = render_arrays
+
+        # MSI line: the zoom window stays at full resolution (matching the
+        # zone fills); only the history before it is thinned with MinMaxLTTB
+        line_x, line_y, line_times = time_deltas, msi, df['timestamp'].to_numpy()
+        if DOWNSAMPLER is not None and len(msi) > MAX_CHART_POINTS:
+            recent = time_deltas >= time_deltas[-1] - ZOOM_MINUTES
+            older = np.flatnonzero(~recent & ~np.isnan(msi))
+            if len(older) > MAX_CHART_POINTS:
+                picked = DOWNSAMPLER.downsample(
+                    time_deltas[older], msi[older], n_out=MAX_CHART_POINTS)
+                older = older[picked]
+            keep = np.sort(np.concatenate([older, np.flatnonzero(recent)]))
+            line_x, line_y, line_times = line_x[keep], line_y[keep], line_times[keep]
+
+        # Enhanced forecast if available
+        forecast = None
+        if st.session_state.forecast_msi and len(df) > 3:
+            try:
+                enhanced = enhance_forecast(st.session_state.forecast_msi, df['msi'].values[-10:])
+                
+                forecast = dict(
+                    x=[time_deltas[-1] + i*5 for i in [1,2,3]],  # 5-min intervals
+                    y=enhanced['original'],
+                    error_y=dict(
+                        type='data',
+                        symmetric=False,
+                        array=enhanced['high'] - enhanced['low'],
+                        arrayminus=enhanced['original'] - enhanced['low']
+                    ),
+                    visible=True
+                )
+            except Exception as e:
+                st.error(f"Forecast error: {str(e)}")
+
+        # ===== 2. Pullback Trap Detection =====
+        centers = time_deltas[traps]  # Relative minutes
+        pullback_zones = list(zip(np.maximum(0, centers - 0.5), centers + 0.5))
+
+        with fig.batch_update():
+            fig.data[0].update(x=time_deltas, y=burst)
+            fig.data[1].update(x=time_deltas, y=surge)
+            fig.data[2].update(x=time_deltas, y=pull)
+            fig.data[3].update(x=line_x, y=line_y, customdata=line_times)
+            if forecast is not None:
+                fig.data[4].update(forecast)
+            else:
+                fig.data[4].visible = False
+
+            # Dynamic zoom for recent activity
+            if len(time_deltas) > 10:
+                last_time = time_deltas[-1]
+                fig.layout.xaxis.range = [max(0, last_time-ZOOM_MINUTES), last_time+5]
+            else:
+                fig.layout.xaxis.range = None
+
+            # Zero line stays first; pullback zones replace the rest in one assignment
+            fig.layout.shapes = [fig.layout.shapes[0]] + [
+                dict(type="rect", xref="x", yref="y domain",
+                     x0=x0, x1=x1, y0=0, y1=1,
+                     fillcolor="red", opacity=0.15,
+                     layer="above", line_width=0)
+                for x0, x1 in pullback_zones
+            ]
         return fig  # Properly indented inside function
 # Display chart header
     st.subheader("🌌 MSI Tactical Display")
     
     # Create and display chart
-    msi_chart = create_msi_chart(df)
-    st.plotly_chart(msi_chart, use_container_width=True)
+    msi_chart = create_msi_chart(df, time_deltas, render_arrays)
+    st.plotly_chart(msi_chart, use_container_width=True, key="msi_chart")
 
     # Log
     st.subheader("Round Log (Editable)")
-    edited = st.data_editor(df.tail(30), use_container_width=True, num_rows="dynamic")
-    st.session_state.roundsc = edited.to_dict('records')
+    shown = df.tail(30)
+    editor_key = f"round_editor_{st.session_state.editor_gen}"
+    st.data_editor(shown, use_container_width=True, num_rows="dynamic",
+                   disabled=["score", "type", "msi", "momentum"],
+                   key=editor_key, on_change=apply_log_edits,
+                   args=(editor_key, len(df) - len(shown)))
      
     # ============== ENHANCED FORECAST BUBBLE ==============
     if len(df) >= WINDOW_SIZE + 3:
         try:
-            avg_score = np.nanmean(df["score"].iloc[-WINDOW_SIZE:])
+            avg_score = np.nanmean(score_arr[-WINDOW_SIZE:])
             if not np.isnan(avg_score):
                 st.session_state.forecast_msi = [
-                    round(df["msi"].iloc[-1] + avg_score*(i+1), 2) 
+                    round(msi_arr[-1] + avg_score*(i+1), 2) 
                     for i in range(3)
                 ]
         except:
@@ -306,16 +495,14 @@ if not df.empty:
             
         with st.container(border=True):
             st.subheader("🔮 Quantum Forecast Bubble")
-            detector = PatternDetector()
-            patterns = detector.detect(df['msi'].values)
+            patterns = memoize("patterns", data_key, lambda: PatternDetector().detect(msi_arr))
             
             cols = st.columns(3)
             cols[0].metric("Current Volatility", f"{patterns.get('volatility', 0)}σ")
             cols[1].metric("Trend Direction", patterns.get('trend', 'N/A'))
             cols[2].metric("Anomaly Count", patterns.get('anomalies', 0))
             
-            enhancer = ForecastEnhancer()
-            enhanced = enhancer.enhance(st.session_state.forecast_msi, df['msi'].values)
+            enhanced = enhance_forecast(st.session_state.forecast_msi, msi_arr[-10:])
             
             st.write("```")
             st.write("Original Forecast:", st.session_state.forecast_msi)
@@ -325,12 +512,12 @@ if not df.empty:
 
     # ============== RISK MANAGEMENT PANEL ==============
     with st.expander("🛡️ Risk Management Suite", expanded=True):
-        wins = len(df[df['multiplier'] >= 2])
-        losses = len(df) - wins
+        wins = int((mult_arr >= 2).sum())
+        losses = mult_arr.size - wins
         risk_ratio = wins/(losses+1e-9)
         
         cols = st.columns(3)
-        cols[0].metric("Win Rate", f"{(wins / (len(df) + 1e-9) * 100):.1f}%")  # Fixed parenthesis
+        cols[0].metric("Win Rate", f"{(wins / (mult_arr.size + 1e-9) * 100):.1f}%")  # Fixed parenthesis
         cols[1].metric("Risk/Reward", f"1:{risk_ratio:.1f}")
         cols[2].progress(
             min(1, risk_ratio/3), 
@@ -340,7 +527,7 @@ if not df.empty:
     # ============== ORIGINAL FUNCTIONALITY PRESERVED ==============
     # Entry Decision
     st.subheader("Entry Decision Assistant")
-    latest_msi = df["msi"].iloc[-1]
+    latest_msi = msi_arr[-1]
     # === Visual Slope Display ===
     msi_slope = get_msi_slope(df)
     
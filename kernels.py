@@ -0,0 +1,74 @@
+"""Numba kernels, kept out of app.py so the compiled dispatchers survive reruns"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+    # Disk cache so new processes skip the JIT; nogil lets concurrent
+    # sessions run kernels in parallel
+    kernel = njit(cache=True, nogil=True)
+except ImportError:  # numba is optional, NumPy/pandas paths are used instead
+    kernel = None
+
+def _rolling_sum(x, w):
+    """Windowed sum in one pass: add the new value, subtract the one leaving"""
+    out = np.empty(len(x), dtype=np.float32)
+    s = 0  # Integer accumulator, scores are small ints so the sum is exact
+    for i in range(len(x)):
+        s += x[i]
+        if i >= w:
+            s -= x[i - w]
+        out[i] = s if i >= w - 1 else np.nan
+    return out
+
+def compute_zone_arrays(msi):
+    """Zone fills: NaN outside each zone so Plotly leaves gaps"""
+    burst = np.where(msi >= 6, msi, np.nan)
+    surge = np.where((msi >= 3) & (msi < 6), msi, np.nan)
+    pull = np.where(msi <= -3, msi, np.nan)
+    return burst, surge, pull
+
+def find_pullback_traps(multipliers, msi):
+    """Mask of rounds closing three Blues or two descending Blues while MSI >= 2"""
+    traps = np.zeros(len(msi), dtype=bool)
+    if len(msi) >= 3:
+        # (N-2, 3) view of consecutive multipliers, row i ends at round i+2
+        w = sliding_window_view(multipliers, 3)
+        three_blues = (w < 2.0).all(axis=1)
+        two_desc = (w[:, 1] < 2.0) & (w[:, 2] < 2.0) & (w[:, 1] > w[:, 2])
+        traps[2:] = (three_blues | two_desc) & (msi[2:] >= 2)
+    return traps
+
+def _build_render_arrays(msi, multipliers):
+    """Zone fills and pullback trap mask in a single pass over msi/multiplier"""
+    n = len(msi)
+    burst = np.empty_like(msi)
+    surge = np.empty_like(msi)
+    pull = np.empty_like(msi)
+    traps = np.zeros(n, dtype=np.bool_)
+    for i in range(n):
+        m = msi[i]
+        burst[i] = m if m >= 6 else np.nan
+        surge[i] = m if (m >= 3 and m < 6) else np.nan
+        pull[i] = m if m <= -3 else np.nan
+        if i >= 2 and m >= 2:
+            m1, m2, m3 = multipliers[i-2], multipliers[i-1], multipliers[i]
+            three_blues = m1 < 2.0 and m2 < 2.0 and m3 < 2.0
+            two_desc = m2 < 2.0 and m3 < 2.0 and m2 > m3
+            traps[i] = three_blues or two_desc
+    return burst, surge, pull, traps
+
+if kernel is not None:
+    rolling_sum = kernel(_rolling_sum)
+    build_render_arrays = kernel(_build_render_arrays)
+
+    # Compile before the first round is entered, not on the first click
+    rolling_sum(np.zeros(4, dtype=np.int32), 2)
+    build_render_arrays(np.zeros(4, dtype=np.float32), np.zeros(4, dtype=np.float64))
+else:
+    def rolling_sum(x, w):
+        return pd.Series(x).rolling(w).sum().to_numpy()
+
+    def build_render_arrays(msi, multipliers):
+        return (*compute_zone_arrays(msi), find_pullback_traps(multipliers, msi))